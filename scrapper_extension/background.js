@@ -1,6 +1,9 @@
 // Function to update the extension's action properties (popup and title)
 // based on the current tab's URL.
 console.log("Service worker started/restarted.");
+// Matches a LinkedIn Company People page URL, capturing the company slug
+const PEOPLE_PAGE_URL_REGEX = /^https:\/\/www\.linkedin\.com\/company\/([^/]+)\/people\/?(?:[\?#].*)?$/;
+
 async function updateExtensionAction(tabId, url) {
     // Check if the URL is a LinkedIn Company People page
     const isLinkedInPeoplePage = url.includes("www.linkedin.com/company/") && url.includes("/people/");
@@ -60,10 +63,349 @@ chrome.runtime.onInstalled.addListener(() => {
     });
 });
 
-// Listener for messages from popup.js or content.js
+// --- Batch mode: harvest many company People pages in background tabs ---
+// The whole run lives in chrome.storage.local, not in memory: MV3 can stop this
+// service worker at any time, so every step re-reads the stored state and a
+// restarted worker picks the run back up. batch.html renders the same state.
+// A job goes queued -> loading (tab opened) -> running (scrape started) -> done/error,
+// or cancelled if the run is stopped before it starts.
+const BATCH_STATE_KEY = 'batchState';
+const BATCH_ALARM_NAME = 'batchPump'; // Periodic wake-up that resumes the run after a restart
+const BATCH_DEFAULT_CONCURRENCY = 3;
+const BATCH_MAX_CONCURRENCY = 6;
+const BATCH_STAGGER_MIN_MS = 3000; // Random gap between tab starts, to avoid a burst of requests
+const BATCH_STAGGER_MAX_MS = 8000;
+const BATCH_PAGE_LOAD_TIMEOUT_MS = 60000;
+const BATCH_IDLE_TIMEOUT_MS = 10 * 60000; // No progress from a scraping tab for this long means it's stuck
+
+const randomStagger = () => BATCH_STAGGER_MIN_MS + Math.random() * (BATCH_STAGGER_MAX_MS - BATCH_STAGGER_MIN_MS);
+
+let batchStateQueue = Promise.resolve();
+let batchPumpTimer = null;
+
+// Runs fn(state) on the stored batch state, if a batch is running, and saves it if fn changed it.
+// fn must be synchronous; calls are serialized so events can't overwrite each other's changes.
+function updateBatchState(fn) {
+    const run = batchStateQueue.then(async () => {
+        const stored = await chrome.storage.local.get(BATCH_STATE_KEY);
+        const state = stored[BATCH_STATE_KEY];
+        if (!state || !state.running) {
+            return undefined;
+        }
+        const before = JSON.stringify(state);
+        const result = fn(state);
+        if (JSON.stringify(state) !== before) {
+            await chrome.storage.local.set({ [BATCH_STATE_KEY]: state });
+        }
+        return result;
+    });
+    batchStateQueue = run.catch(() => { });
+    return run;
+}
+
+function closeBatchTab(tabId) {
+    if (tabId !== null && tabId !== undefined) {
+        chrome.tabs.remove(tabId).catch(() => { }); // The user may have closed it already
+    }
+}
+
+// Marks the job scraping in tabId as finished, closes its tab and starts the next company.
+async function endBatchJob(tabId, status, count, message) {
+    const ended = await updateBatchState(state => {
+        const job = state.jobs.find(j => j.tabId === tabId && (j.status === 'loading' || j.status === 'running'));
+        if (!job) {
+            return false;
+        }
+        job.status = status;
+        job.count = count === undefined ? job.count : count;
+        job.message = message || '';
+        job.tabId = null;
+        return true;
+    });
+    if (ended) {
+        closeBatchTab(tabId);
+        await pumpBatch();
+    }
+}
+
+// Fails stuck jobs, opens tabs for queued companies (staggered, at most `concurrency`
+// at once) and ends the run once nothing is left. Safe to call at any time.
+async function pumpBatch() {
+    const actions = await updateBatchState(state => {
+        const now = Date.now();
+        const actions = { close: [], start: [], wakeAt: null, running: true };
+
+        state.jobs.forEach(job => {
+            const timeout = job.status === 'loading' ? BATCH_PAGE_LOAD_TIMEOUT_MS
+                : job.status === 'running' ? BATCH_IDLE_TIMEOUT_MS : null;
+            if (timeout && now - job.updatedAt > timeout) {
+                job.message = job.status === 'loading' ? 'Timed out waiting for the page to load' : 'No progress from the scraping tab';
+                job.status = 'error';
+                actions.close.push(job.tabId);
+                job.tabId = null;
+            }
+        });
+
+        let active = state.jobs.filter(job => job.status === 'loading' || job.status === 'running').length;
+        while (!state.cancelled && active < state.concurrency) {
+            const job = state.jobs.find(j => j.status === 'queued');
+            if (!job) {
+                break;
+            }
+            if (now < state.nextStartAt) {
+                actions.wakeAt = state.nextStartAt;
+                break;
+            }
+            job.status = 'loading';
+            job.updatedAt = now;
+            state.nextStartAt = now + randomStagger();
+            actions.start.push(job.company);
+            active++;
+        }
+
+        const queued = state.jobs.some(job => job.status === 'queued');
+        if (active === 0 && (state.cancelled || !queued)) {
+            state.jobs.forEach(job => {
+                if (job.status === 'queued') {
+                    job.status = 'cancelled';
+                }
+            });
+            state.running = false;
+            state.finishedAt = now;
+            actions.running = false;
+        }
+        return actions;
+    });
+
+    if (!actions || !actions.running) {
+        clearTimeout(batchPumpTimer);
+        await chrome.alarms.clear(BATCH_ALARM_NAME);
+        if (!actions) {
+            return;
+        }
+    }
+    actions.close.forEach(closeBatchTab);
+    actions.start.forEach(openBatchTab);
+    if (actions.wakeAt) {
+        // The alarm covers this too, but only every 30 s; this keeps the stagger short while we're awake
+        clearTimeout(batchPumpTimer);
+        batchPumpTimer = setTimeout(pumpBatch, actions.wakeAt - Date.now());
+    }
+}
+
+// Opens the People page of a company in an inactive tab.
+async function openBatchTab(company) {
+    const job = await updateBatchState(state => state.jobs.find(j => j.company === company && j.status === 'loading'));
+    if (!job) {
+        return;
+    }
+
+    let tab;
+    try {
+        tab = await chrome.tabs.create({ url: job.url, active: false });
+    } catch (error) {
+        await updateBatchState(state => {
+            const failedJob = state.jobs.find(j => j.company === company && j.status === 'loading');
+            if (failedJob) {
+                failedJob.status = 'error';
+                failedJob.message = error.message;
+            }
+        });
+        await pumpBatch();
+        return;
+    }
+
+    const stillWanted = await updateBatchState(state => {
+        const loadingJob = state.jobs.find(j => j.company === company && j.status === 'loading');
+        if (loadingJob) {
+            loadingJob.tabId = tab.id;
+        }
+        return Boolean(loadingJob);
+    });
+    if (!stillWanted) { // Timed out or the run ended meanwhile
+        closeBatchTab(tab.id);
+        return;
+    }
+
+    // The tab may have finished loading before its id was stored, in which case
+    // the onUpdated listener below already ignored the 'complete' event.
+    const currentTab = await chrome.tabs.get(tab.id).catch(() => null);
+    if (currentTab && currentTab.status === 'complete') {
+        await onBatchTabLoaded(tab.id, currentTab.url);
+    }
+}
+
+// Starts scrapePeoplePage in a loaded batch tab. The scrape is not awaited here
+// (it can take many minutes): the tab reports back with 'peoplePageDone'.
+async function onBatchTabLoaded(tabId, url) {
+    if (!url || url.startsWith('about:')) {
+        return; // The new tab's initial blank page, not the People page yet
+    }
+    const job = await updateBatchState(state => {
+        const loadingJob = state.jobs.find(j => j.tabId === tabId && j.status === 'loading');
+        if (loadingJob && PEOPLE_PAGE_URL_REGEX.test(url || '')) {
+            loadingJob.status = 'running';
+            loadingJob.updatedAt = Date.now();
+        }
+        return loadingJob ? { ...loadingJob } : null;
+    });
+    if (!job) {
+        return;
+    }
+    if (job.status !== 'running') {
+        // LinkedIn redirects to the login/authwall page when the session has expired
+        await endBatchJob(tabId, 'error', undefined, `Redirected away from the People page (${url})`);
+        return;
+    }
+
+    try {
+        await chrome.scripting.executeScript({
+            target: { tabId: tabId },
+            func: async (targetFilename) => { // Runs in the content script's isolated world
+                // content.js is injected at document_idle, which can be just after 'complete'
+                for (let i = 0; i < 20 && typeof window.scrapePeoplePage !== 'function'; i++) {
+                    await new Promise(resolve => setTimeout(resolve, 500));
+                }
+                if (typeof window.scrapePeoplePage !== 'function') {
+                    chrome.runtime.sendMessage({
+                        action: 'peoplePageDone',
+                        result: { success: false, count: 0, message: "scrapePeoplePage function not found in content script." }
+                    });
+                    return;
+                }
+                window.scrapePeoplePage(targetFilename, { batch: true }); // Not awaited on purpose
+            },
+            args: [job.filename]
+        });
+    } catch (error) {
+        await endBatchJob(tabId, 'error', undefined, `Error executing content script: ${error.message}`);
+    }
+}
+
+// Validates the pasted URLs and starts a batch. Resolves with a response for the caller.
+async function startBatch(urls, filenamePrefix, concurrency) {
+    const stored = await chrome.storage.local.get(BATCH_STATE_KEY);
+    if (stored[BATCH_STATE_KEY] && stored[BATCH_STATE_KEY].running) {
+        return { success: false, message: "A batch is already running." };
+    }
+
+    const jobs = [];
+    const invalidUrls = [];
+    const seenCompanies = new Set();
+    (urls || []).map(url => url.trim()).filter(Boolean).forEach(url => {
+        const match = url.match(PEOPLE_PAGE_URL_REGEX);
+        if (!match) {
+            invalidUrls.push(url);
+            return;
+        }
+        const company = match[1];
+        if (seenCompanies.has(company)) {
+            return; // Same company pasted twice
+        }
+        seenCompanies.add(company);
+        jobs.push({
+            url: url,
+            company: company,
+            // Each company gets its own file on the server
+            filename: filenamePrefix ? `${filenamePrefix}_${company}` : company,
+            status: 'queued',
+            count: 0,
+            message: '',
+            tabId: null,
+            updatedAt: null
+        });
+    });
+
+    if (invalidUrls.length > 0) {
+        return { success: false, message: `Not Company People page URLs: ${invalidUrls.join(", ")}` };
+    }
+    if (jobs.length === 0) {
+        return { success: false, message: "No URLs provided." };
+    }
+
+    const poolSize = Math.max(1, Math.min(parseInt(concurrency, 10) || BATCH_DEFAULT_CONCURRENCY, BATCH_MAX_CONCURRENCY));
+    const state = {
+        running: true,
+        cancelled: false,
+        concurrency: poolSize,
+        nextStartAt: 0,
+        startedAt: Date.now(),
+        finishedAt: null,
+        jobs: jobs
+    };
+    await chrome.storage.local.set({ [BATCH_STATE_KEY]: state });
+    await chrome.alarms.create(BATCH_ALARM_NAME, { periodInMinutes: 0.5 });
+    pumpBatch();
+    return { success: true, message: `Started batch of ${jobs.length} companies with ${poolSize} tabs.` };
+}
+
+// Batch tabs that finished loading (including ones opened before a worker restart)
+chrome.tabs.onUpdated.addListener((tabId, changeInfo, tab) => {
+    if (changeInfo.status === 'complete') {
+        onBatchTabLoaded(tabId, tab.url);
+    }
+});
+
+// A batch tab closed by the user can't report back; fail its job right away
+chrome.tabs.onRemoved.addListener((tabId) => {
+    endBatchJob(tabId, 'error', undefined, 'Tab was closed');
+});
+
+chrome.alarms.onAlarm.addListener((alarm) => {
+    if (alarm.name === BATCH_ALARM_NAME) {
+        pumpBatch();
+    }
+});
+
+// Resume a run that was in progress when the service worker was stopped
+pumpBatch();
+
+// Listener for messages from popup.js, batch.js or content.js
 // The popup will send a message here when the "Scrap Data" button is clicked.
-// Listener for messages from popup.js or content.js
 chrome.runtime.onMessage.addListener((message, sender, sendResponse) => {
+    if (message.action === 'startBatchScrape') {
+        startBatch(message.urls, message.filenamePrefix, message.concurrency).then(sendResponse);
+        return true; // sendResponse is called asynchronously
+    }
+
+    if (message.action === 'cancelBatchScrape') {
+        updateBatchState(state => {
+            state.cancelled = true; // Running tabs finish, queued companies are skipped
+            return true;
+        }).then(cancelled => {
+            sendResponse(cancelled
+                ? { success: true, message: "Batch will stop after the running companies finish." }
+                : { success: false, message: "No batch is running." });
+            pumpBatch();
+        });
+        return true; // sendResponse is called asynchronously
+    }
+
+    // Running profile count from scrapePeoplePage in a batch tab
+    if (message.action === 'peoplePageProgress') {
+        if (sender.tab) {
+            updateBatchState(state => {
+                const job = state.jobs.find(j => j.tabId === sender.tab.id && j.status === 'running');
+                if (job) {
+                    job.count = message.count;
+                    job.updatedAt = Date.now();
+                }
+            });
+        }
+        sendResponse({ success: true });
+        return;
+    }
+
+    // Final result from scrapePeoplePage in a batch tab
+    if (message.action === 'peoplePageDone') {
+        if (sender.tab) {
+            const result = message.result || {};
+            endBatchJob(sender.tab.id, result.success ? 'done' : 'error', result.count, result.message);
+        }
+        sendResponse({ success: true });
+        return;
+    }
+
     // Check if the message is to execute the content script
     if (message.action === 'executeContentScript') {
         // Instead of directly using sender.tab.url, query for the active tab's URL
@@ -75,7 +417,7 @@ chrome.runtime.onMessage.addListener((message, sender, sendResponse) => {
 
                 // Apply the URL validation logic using the queried tab URL
                 // Use the more robust regex from our previous discussion or your current includes checks
-                const isLinkedInPeoplePage = /^https:\/\/www\.linkedin\.com\/company\/[^/]+\/people\/?(?:[\?#].*)?$/.test(currentTabUrl);
+                const isLinkedInPeoplePage = PEOPLE_PAGE_URL_REGEX.test(currentTabUrl);
                 // OR your original simpler checks if you prefer:
                 // const isLinkedInPeoplePage = currentTabUrl.includes("www.linkedin.com/company/") && currentTabUrl.includes("/people/");
 
@@ -0,0 +1,71 @@
+document.addEventListener('DOMContentLoaded', function () {
+    // The batch itself runs in background.js; this view only starts/stops it
+    // and renders the progress that background.js keeps in chrome.storage.local.
+    const BATCH_STATE_KEY = 'batchState';
+    const statusElement = document.getElementById('batch-status');
+    const rowsElement = document.getElementById('batch-rows');
+
+    function renderBatchState(state) {
+        rowsElement.textContent = '';
+        if (!state) {
+            statusElement.textContent = 'No batch has been run yet.';
+            return;
+        }
+
+        const finished = state.jobs.filter(job => job.status === 'done' || job.status === 'error' || job.status === 'cancelled').length;
+        const profiles = state.jobs.reduce((total, job) => total + (job.count || 0), 0);
+        statusElement.textContent = state.running
+            ? `Running: ${finished}/${state.jobs.length} companies finished, ${profiles} profiles so far.`
+            : `Finished: ${finished}/${state.jobs.length} companies, ${profiles} profiles.`;
+
+        state.jobs.forEach(job => {
+            const row = document.createElement('tr');
+            const companyCell = document.createElement('td');
+            companyCell.textContent = job.company;
+            companyCell.title = `${job.url}\nSaved to ${job.filename}.json`;
+            const statusCell = document.createElement('td');
+            statusCell.textContent = job.status;
+            statusCell.className = `status-${job.status}`;
+            statusCell.title = job.message || '';
+            const countCell = document.createElement('td');
+            countCell.textContent = job.count;
+            row.append(companyCell, statusCell, countCell);
+            rowsElement.appendChild(row);
+        });
+    }
+
+    // Initial render, then live updates whenever background.js saves the state
+    chrome.storage.local.get(BATCH_STATE_KEY).then(stored => renderBatchState(stored[BATCH_STATE_KEY]));
+    chrome.storage.onChanged.addListener((changes, areaName) => {
+        if (areaName === 'local' && changes[BATCH_STATE_KEY]) {
+            renderBatchState(changes[BATCH_STATE_KEY].newValue);
+        }
+    });
+
+    document.getElementById('start-batch-btn').addEventListener('click', function () {
+        const urls = document.getElementById('urls-input').value.split('\n');
+        chrome.runtime.sendMessage({
+            action: 'startBatchScrape',
+            urls: urls,
+            filenamePrefix: document.getElementById('prefix-input').value.trim(),
+            concurrency: document.getElementById('concurrency-input').value
+        }, function (response) {
+            if (chrome.runtime.lastError) {
+                console.error('Could not start batch:', chrome.runtime.lastError.message);
+                statusElement.textContent = `❌ ${chrome.runtime.lastError.message}`;
+            } else if (!response.success) {
+                statusElement.textContent = `❌ ${response.message}`;
+            }
+        });
+    });
+
+    document.getElementById('cancel-batch-btn').addEventListener('click', function () {
+        chrome.runtime.sendMessage({ action: 'cancelBatchScrape' }, function (response) {
+            if (chrome.runtime.lastError) {
+                console.error('Could not stop batch:', chrome.runtime.lastError.message);
+            } else {
+                statusElement.textContent = response.message;
+            }
+        });
+    });
+});
@@ -9,14 +9,31 @@ const BASE_BACKEND_URL = 'http://localhost:5000';
 
 const delay = (ms) => new Promise(resolve => setTimeout(resolve, ms));
 
+// Helper to collect the unique profile URLs currently on the page
+const collectProfileUrls = () => {
+    const anchors = [...document.querySelectorAll("a[href*='/in/']")];
+    return [...new Set(anchors.map(a => a.href.split("?")[0]))];
+};
+
 /**
  * Scrapes LinkedIn company "People" page for profile URLs.
  * This is the existing functionality, now wrapped in a function.
  * @param {string} filename The filename to use for saving data on the server.
+ * @param {Object} [options]
+ * @param {boolean} [options.batch] Set by the background batch mode: no alerts (the tab is
+ *   in the background), progress and the final result are sent to the service worker.
+ * @returns {Promise<{success: boolean, count: number, message: string}>}
  */
-async function scrapePeoplePage(filename) {
+async function scrapePeoplePage(filename, options = {}) {
     console.log("🔄 Starting scroll and scrape for People page...");
 
+    // Alerts would block an unattended background tab, so only log them in batch mode
+    const notify = (text) => {
+        if (!options.batch) {
+            alert(text);
+        }
+    };
+
     const scrollAndLoad = async () => {
         let lastHeight = 0;
         let retries = 10; // Number of times to retry if scroll height doesn't change
@@ -27,6 +44,12 @@ async function scrapePeoplePage(filename) {
 
             const newHeight = document.body.scrollHeight;
 
+            if (options.batch) {
+                // Report the running profile count to the batch view
+                chrome.runtime.sendMessage({ action: 'peoplePageProgress', count: collectProfileUrls().length })
+                    .catch(err => console.warn("⚠️ Could not report progress:", err));
+            }
+
             const seeMoreBtn = [...document.querySelectorAll("button")].find(btn => {
                 const text = btn.innerText || btn.textContent || "";
                 return text.trim().toLowerCase().includes("show more results");
@@ -61,12 +84,12 @@ async function scrapePeoplePage(filename) {
 
     await scrollAndLoad();
 
-    const anchors = [...document.querySelectorAll("a[href*='/in/']")];
-    const profileUrls = [...new Set(anchors.map(a => a.href.split("?")[0]))];
+    const profileUrls = collectProfileUrls();
 
     console.log("✅ Final profile count:", profileUrls.length);
 
     // Send the data to your Flask backend
+    let result;
     try {
         const response = await fetch(`${BASE_BACKEND_URL}/save_urls`, {
             method: "POST",
@@ -76,108 +99,223 @@ async function scrapePeoplePage(filename) {
         const data = await response.json();
         if (response.ok) { // Check if response status is 2xx
             console.log("✅ Profile URLs successfully sent to server:", data.message);
-            alert(`✅ ${profileUrls.length} profile URLs saved to ${filename}.json!`);
+            result = { success: true, count: profileUrls.length, message: data.message };
+            notify(`✅ ${profileUrls.length} profile URLs saved to ${filename}.json!`);
         } else {
             console.error("❌ Error sending profile URLs to server (Status: " + response.status + "):", data.message);
-            alert(`❌ Error saving profile URLs: ${data.message}`);
+            result = { success: false, count: profileUrls.length, message: data.message || data.error };
+            notify(`❌ Error saving profile URLs: ${data.message}`);
         }
     } catch (error) {
         console.error("❌ Fetch error when sending profile URLs:", error);
-        alert(`❌ Network error saving profile URLs: ${error.message}`);
+        result = { success: false, count: profileUrls.length, message: error.message };
+        notify(`❌ Network error saving profile URLs: ${error.message}`);
     }
 
     console.log("🏁 People page scrape process finished.");
+    if (options.batch) {
+        // The service worker doesn't wait on this call, so report the result to it
+        chrome.runtime.sendMessage({ action: 'peoplePageDone', result: result })
+            .catch(err => console.warn("⚠️ Could not report result:", err));
+    }
+    return result;
 }
 
 
+// Profile "details" pages that hold the complete lists for each section.
+// These are fetched directly instead of scrolling/clicking "Show all" on the profile.
+const PROFILE_DETAIL_SECTIONS = ["experience", "education", "skills"];
+
+// Top-level entities on a details page vs. on the main profile page.
+const DETAILS_PAGE_ITEM_SELECTOR = "li.pvs-list__paged-list-item > div[data-view-name='profile-component-entity']";
+const PROFILE_PAGE_ITEM_SELECTOR = "li.artdeco-list__item > div[data-view-name='profile-component-entity']";
+
+// Helper to get trimmed text of the first match inside an element ("" if missing)
+const getEntityText = (item, selector) => {
+    const el = item.querySelector(selector);
+    return el ? el.textContent.trim() : "";
+};
+
 /**
- * Extracts experience details from the current LinkedIn profile page.
- * This is the new functionality.
+ * Returns the profile's base URL (e.g. https://www.linkedin.com/in/first-last/)
+ * for the current page, or null if this is not a profile page.
  */
-// content.js - MODIFIED extractProfileDetails function
+function getProfileBaseUrl() {
+    const match = window.location.pathname.match(/^\/in\/[^/]+/);
+    return match ? `${window.location.origin}${match[0]}/` : null;
+}
 
-async function extractProfileDetails() {
-    console.log("Starting profile experience extraction...");
+/**
+ * Fetches one of the profile's details pages using the page's own session
+ * and parses it with DOMParser, off the visible DOM.
+ * @param {string} profileBaseUrl The profile base URL from getProfileBaseUrl().
+ * @param {string} section One of PROFILE_DETAIL_SECTIONS.
+ * @returns {Promise<Document|null>} The parsed page, or null if the fetch failed.
+ */
+async function fetchProfileDetailsPage(profileBaseUrl, section) {
+    try {
+        const response = await fetch(`${profileBaseUrl}details/${section}/`, { credentials: "include" });
+        if (!response.ok) {
+            console.warn(`⚠️ Could not fetch ${section} details page (Status: ${response.status})`);
+            return null;
+        }
+        const html = await response.text();
+        return new DOMParser().parseFromString(html, "text/html");
+    } catch (error) {
+        console.warn(`⚠️ Fetch error for ${section} details page:`, error);
+        return null;
+    }
+}
 
-    const experiences = [];
+/**
+ * Parses experience entities (job title, company, duration) under root.
+ */
+function parseExperienceItems(root, itemSelector) {
+    return [...root.querySelectorAll(itemSelector)].map(item => {
+        // Company and employment type share one span, e.g. "Acme · Full-time"
+        const [company = ""] = getEntityText(item, "span.t-14.t-normal span[aria-hidden='true']").split("·").map(s => s.trim());
+        return {
+            jobTitle: getEntityText(item, "div.t-bold span[aria-hidden='true']"),
+            company: company,
+            duration: getEntityText(item, "span.t-14.t-normal.t-black--light span[aria-hidden='true']")
+        };
+    });
+}
 
-    // --- START OF ADDED/MODIFIED CODE FOR PROFILE URL AND NAME ---
-    const profileUrl = window.location.href.split('?')[0]; // Get current URL, remove query parameters
-    let profileName = "Unknown Profile";
+/**
+ * Parses education entities (school, degree, duration) under root.
+ */
+function parseEducationItems(root, itemSelector) {
+    return [...root.querySelectorAll(itemSelector)].map(item => ({
+        school: getEntityText(item, "div.t-bold span[aria-hidden='true']"),
+        degree: getEntityText(item, "span.t-14.t-normal span[aria-hidden='true']"),
+        duration: getEntityText(item, "span.t-14.t-normal.t-black--light span[aria-hidden='true']")
+    })).filter(entry => entry.school);
+}
 
-    // Attempt to get the profile name from a common LinkedIn element
-    // This often corresponds to the H1 tag at the top of the profile
-    const profileNameElement = document.querySelector('h1.inline.t-24.v-align-middle.break-words');
-    if (profileNameElement) {
-        profileName = profileNameElement.textContent.trim();
-    } else {
-        // Fallback: Try to get the name from the document title
-        // e.g., "John Doe | LinkedIn" -> "John Doe"
-        const titleMatch = document.title.match(/^(.*?) \| LinkedIn$/);
-        if (titleMatch && titleMatch[1]) {
-            profileName = titleMatch[1].trim();
+/**
+ * Parses skill names under root, without duplicates.
+ */
+function parseSkillItems(root, itemSelector) {
+    const skills = [...root.querySelectorAll(itemSelector)]
+        .map(item => getEntityText(item, "div.t-bold span[aria-hidden='true']"))
+        .filter(Boolean);
+    return [...new Set(skills)];
+}
+
+/**
+ * Parses one section, preferring the fetched details page (complete list)
+ * and falling back to the section shown on the profile page itself.
+ * @param {Document|null} detailsDoc The parsed details page, if it was fetched.
+ * @param {string} anchorId The section's anchor ID on the profile page (e.g. "experience").
+ * @param {Function} parseItems One of the parse*Items functions.
+ */
+function parseProfileSection(detailsDoc, anchorId, parseItems) {
+    if (detailsDoc) {
+        const items = parseItems(detailsDoc, DETAILS_PAGE_ITEM_SELECTOR);
+        if (items.length > 0) {
+            return items;
         }
+        console.warn(`Details page for '${anchorId}' had no items, falling back to the profile page.`);
     }
-    console.log(`Extracting experiences for: ${profileName} (${profileUrl})`);
-    // --- END OF ADDED/MODIFIED CODE FOR PROFILE URL AND NAME ---
-
-
-    // Find the main experience section using its unique ID anchor and then its closest parent section
-    const experienceAnchor = document.getElementById("experience");
-    const experienceSection = experienceAnchor ? experienceAnchor.closest("section") : null;
-
-    if (experienceSection) {
-        // Select each individual experience item.
-        // These are typically divs with data-view-name='profile-component-entity' inside list items.
-        const experienceItems = experienceSection.querySelectorAll("li.artdeco-list__item > div[data-view-name='profile-component-entity']");
-
-        experienceItems.forEach(item => {
-            // Extract Job Title
-            const jobTitleElement = item.querySelector("div.t-bold span[aria-hidden='true']");
-            const jobTitle = jobTitleElement ? jobTitleElement.textContent.trim() : "";
-
-            // Extract Company and Employment Type
-            const companyAndTypeElement = item.querySelector("span.t-14.t-normal span[aria-hidden='true']");
-            let company = "";
-            let employmentType = "";
-            if (companyAndTypeElement) {
-                const companyText = companyAndTypeElement.textContent.trim();
-                const parts = companyText.split("·").map(s => s.trim());
-                company = parts[0] || "";
-                employmentType = parts[1] || "";
-            }
-
-            // Extract Duration
-            const durationElement = item.querySelector("span.t-14.t-normal.t-black--light span[aria-hidden='true']");
-            const duration = durationElement ? durationElement.textContent.trim() : "";
+    const anchor = document.getElementById(anchorId);
+    const section = anchor ? anchor.closest("section") : null;
+    return section ? parseItems(section, PROFILE_PAGE_ITEM_SELECTOR) : [];
+}
 
-            experiences.push({ jobTitle, company, duration });
-        });
+/**
+ * Builds a raw HTML snapshot of the profile for the server's extractor
+ * (server/profile_extractor.py). Each part is wrapped in
+ * <section data-snapshot-section="..."> so the extractor can tell them apart:
+ * the name element extractProfileDetails() reads, and per section both the
+ * fetched details page's <main> and the section shown on the profile page.
+ * Nothing is filtered here with our selectors, so a later extractor version
+ * can still read pages whose markup those selectors no longer match.
+ * @param {Element|null} profileNameElement The top card name element.
+ * @param {Array<Document|null>} detailsDocs Parsed details pages, in PROFILE_DETAIL_SECTIONS order.
+ */
+function buildProfileSnapshot(profileNameElement, detailsDocs) {
+    const title = document.createElement("title");
+    title.textContent = document.title;
+    const parts = [title.outerHTML];
+    if (profileNameElement) {
+        parts.push(`<section data-snapshot-section="name">${profileNameElement.outerHTML}</section>`);
+    }
 
-        // Check for "Show all experiences" button
-        const showAllExperiencesButton = document.getElementById("navigation-index-see-all-experiences");
-        if (showAllExperiencesButton) {
-            console.log("Found 'Show all experiences' button. If more experiences exist, you might need to click this and re-run the script.");
-            // OPTIONAL: If you want to automatically click this and re-extract, uncomment below:
-            // showAllExperiencesButton.click();
-            // await delay(2000); // Wait for content to load after click
-            // // You might need to call extractProfileDetails() again here to get newly loaded items
-        } else {
-            console.log("'Show all experiences' button not found or already clicked/no more experiences to show.");
+    PROFILE_DETAIL_SECTIONS.forEach((section, index) => {
+        const doc = detailsDocs[index];
+        const detailsRoot = doc && (doc.querySelector("main") || doc.body);
+        if (detailsRoot) {
+            parts.push(`<section data-snapshot-section="${section}" data-snapshot-source="details">${detailsRoot.outerHTML}</section>`);
         }
+        const anchor = document.getElementById(section);
+        const pageSection = anchor ? anchor.closest("section") : null;
+        if (pageSection) {
+            parts.push(`<section data-snapshot-section="${section}" data-snapshot-source="page">${pageSection.outerHTML}</section>`);
+        }
+    });
+    return parts.join("\n");
+}
 
-    } else {
-        console.warn("Experience section not found on the page using anchor ID 'experience'. Please ensure you are on a LinkedIn profile page and the structure matches.");
+/**
+ * Gzip-compresses text and returns it base64 encoded.
+ */
+async function gzipToBase64(text) {
+    const stream = new Blob([text]).stream().pipeThrough(new CompressionStream("gzip"));
+    const bytes = new Uint8Array(await new Response(stream).arrayBuffer());
+    let binary = "";
+    for (let i = 0; i < bytes.length; i += 0x8000) { // Chunked to stay under the argument limit
+        binary += String.fromCharCode.apply(null, bytes.subarray(i, i + 0x8000));
+    }
+    return btoa(binary);
+}
+
+/**
+ * Posts a compressed snapshot of the profile HTML to the Flask backend, which
+ * stores it, parses it in its process pool and saves the profile details.
+ * Stored snapshots can be re-parsed with a newer extractor later, without
+ * re-visiting the profile.
+ * @returns {Promise<Object|null>} The server's response, or null if the server couldn't save/parse it.
+ */
+async function sendProfileSnapshot(profileUrl, profileNameElement, detailsDocs) {
+    try {
+        const snapshot = await gzipToBase64(buildProfileSnapshot(profileNameElement, detailsDocs));
+        const response = await fetch(`${BASE_BACKEND_URL}/save_snapshot`, {
+            method: "POST",
+            headers: { "Content-Type": "application/json" },
+            body: JSON.stringify({ profileUrl: profileUrl, snapshot: snapshot })
+        });
+        const data = await response.json();
+        if (response.ok) {
+            console.log("✅ Profile snapshot parsed and saved by server:", data.message);
+            return data;
+        }
+        console.error("❌ Error sending profile snapshot (Status: " + response.status + "):", data.message || data.error);
+    } catch (error) {
+        console.error("❌ Fetch error when sending profile snapshot:", error);
     }
+    return null;
+}
+
+/**
+ * Parses the profile in the browser and posts the result to /save_experience_details.
+ * Only used when the server couldn't take the snapshot (see sendProfileSnapshot).
+ */
+async function saveParsedProfileDetails(profileUrl, profileName, detailsDocs) {
+    const [experienceDoc, educationDoc, skillsDoc] = detailsDocs;
+    const experiences = parseProfileSection(experienceDoc, "experience", parseExperienceItems);
+    const education = parseProfileSection(educationDoc, "education", parseEducationItems);
+    const skills = parseProfileSection(skillsDoc, "skills", parseSkillItems);
 
     console.log("Extracted Experiences:", experiences);
+    console.log("Extracted Education:", education);
+    console.log("Extracted Skills:", skills);
 
-    if (experiences.length === 0 && experienceSection) {
-        console.warn("No experiences extracted from the found section. This might happen if the HTML structure within the section has changed, or if there's a 'Show all experiences' button that needs clicking to reveal content.");
+    if (experiences.length === 0) {
+        console.warn("No experiences extracted. The details page could not be fetched or the HTML structure has changed. Please ensure you are on a LinkedIn profile page.");
     }
 
-    // --- START OF MODIFIED CODE FOR FETCH REQUEST BODY ---
-    // Send the extracted experiences, profile URL, and profile Name to your Flask backend
+    // Send the extracted details, profile URL, and profile Name to your Flask backend
     try {
         const response = await fetch(`${BASE_BACKEND_URL}/save_experience_details`, {
             method: "POST",
@@ -185,13 +323,15 @@ async function extractProfileDetails() {
             body: JSON.stringify({
                 profileUrl: profileUrl,
                 profileName: profileName,
-                experiences: experiences
+                experiences: experiences,
+                education: education,
+                skills: skills
             })
         });
         const data = await response.json();
         if (response.ok) { // Check if response status is 2xx
             console.log("✅ Experience details successfully sent to server:", data.message);
-            alert(`✅ ${experiences.length} experiences for ${profileName} saved!`); // Updated alert message
+            alert(`✅ ${experiences.length} experiences for ${profileName} saved!`);
         } else {
             console.error("❌ Error sending experience details to server (Status: " + response.status + "):", data.message);
             alert(`❌ Error saving experiences: ${data.message}`);
@@ -200,9 +340,50 @@ async function extractProfileDetails() {
         console.error("❌ Fetch error when sending experience details:", error);
         alert(`❌ Network error saving experiences: ${error.message}`);
     }
-    // --- END OF MODIFIED CODE FOR FETCH REQUEST BODY ---
+}
+
+/**
+ * Extracts experience, education and skills for the current LinkedIn profile.
+ * The full details pages are fetched in parallel, so no scrolling or "Show all"
+ * clicking is needed. The HTML is sent to the server, which parses and saves it;
+ * parsing in the browser is only the fallback when that fails.
+ */
+async function extractProfileDetails() {
+    console.log("Starting profile details extraction...");
+
+    const profileUrl = window.location.href.split('?')[0]; // Get current URL, remove query parameters
+    let profileName = "Unknown Profile";
+
+    // Attempt to get the profile name from a common LinkedIn element
+    // This often corresponds to the H1 tag at the top of the profile
+    const profileNameElement = document.querySelector('h1.inline.t-24.v-align-middle.break-words');
+    if (profileNameElement) {
+        profileName = profileNameElement.textContent.trim();
+    } else {
+        // Fallback: Try to get the name from the document title
+        // e.g., "John Doe | LinkedIn" -> "John Doe"
+        const titleMatch = document.title.match(/^(.*?) \| LinkedIn$/);
+        if (titleMatch && titleMatch[1]) {
+            profileName = titleMatch[1].trim();
+        }
+    }
+    console.log(`Extracting details for: ${profileName} (${profileUrl})`);
+
+    // Fetch all details pages concurrently
+    const profileBaseUrl = getProfileBaseUrl();
+    const detailsDocs = profileBaseUrl
+        ? await Promise.all(PROFILE_DETAIL_SECTIONS.map(section => fetchProfileDetailsPage(profileBaseUrl, section)))
+        : [null, null, null];
+
+    const serverResult = await sendProfileSnapshot(profileUrl, profileNameElement, detailsDocs);
+    if (serverResult) {
+        alert(`✅ ${serverResult.experienceCount} experiences for ${serverResult.profileName} saved!`);
+    } else {
+        console.warn("Server-side parsing unavailable, parsing the profile in the browser instead.");
+        await saveParsedProfileDetails(profileUrl, profileName, detailsDocs);
+    }
 
-    console.log("🏁 Profile experience extraction finished.");
+    console.log("🏁 Profile details extraction finished.");
 }
 
 // Ensure these functions are accessible from popup.js when executed via chrome.scripting.executeScript
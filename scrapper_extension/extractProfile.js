@@ -42,23 +42,32 @@
         return false;
     };
 
-    // --- General scroll function for dynamic content ---
-    const scrollAndLoad = async () => {
-        let lastHeight = 0;
-        let retries = 5; // Reduced retries for single profile, can adjust
-        while (retries > 0) {
-            window.scrollTo(0, document.body.scrollHeight);
-            await delay(1500);
-            const newHeight = document.body.scrollHeight;
-            if (newHeight === lastHeight) {
-                retries--;
-            } else {
-                retries = 5;
-                lastHeight = newHeight;
+    // --- Fetch a profile details page (experience/education/skills) with the page's session ---
+    // Parsed with DOMParser off the visible DOM, so no scrolling or "Show all" clicks are needed.
+    const profileMatch = window.location.pathname.match(/^\/in\/[^/]+/);
+    const profileBaseUrl = profileMatch ? `${window.location.origin}${profileMatch[0]}/` : null;
+    const fetchDetailsPage = async (section) => {
+        if (!profileBaseUrl) return null;
+        try {
+            const response = await fetch(`${profileBaseUrl}details/${section}/`, { credentials: "include" });
+            if (!response.ok) {
+                console.warn(`Could not fetch ${section} details page (Status: ${response.status})`);
+                return null;
             }
+            return new DOMParser().parseFromString(await response.text(), "text/html");
+        } catch (e) {
+            console.warn(`Fetch failed for ${section} details page:`, e);
+            return null;
         }
     };
 
+    // Start all details page fetches now; they run while the top card is read
+    const detailsPages = Promise.all([
+        fetchDetailsPage("experience"),
+        fetchDetailsPage("education"),
+        fetchDetailsPage("skills")
+    ]);
+
     // --- Extract Name ---
     profile.name = getText("h1.top-card-layout__title");
     if (!profile.name) { // Fallback for some profile types
@@ -81,58 +90,51 @@
     }
     console.log("About:", profile.about);
 
-    // --- Scroll to load Experience/Education/Skills (dynamic sections) ---
-    await scrollAndLoad();
-    await delay(1000); // Give a moment for new content to render
+    // --- Wait for the Experience/Education/Skills details pages ---
+    const [experienceDoc, educationDoc, skillsDoc] = await detailsPages;
+    // Top-level entities only: grouped positions nest their roles as entities inside the company item.
+    // Same selectors and on-page fallback as parseProfileSection() in content.js.
+    const detailsItemSelector = "li.pvs-list__paged-list-item > div[data-view-name='profile-component-entity']";
+    const pageItemSelector = "li.artdeco-list__item > div[data-view-name='profile-component-entity']";
+    const getSectionItems = (detailsDoc, anchorId) => {
+        const detailsItems = detailsDoc ? [...detailsDoc.querySelectorAll(detailsItemSelector)] : [];
+        if (detailsItems.length > 0) {
+            return detailsItems;
+        }
+        const anchor = document.getElementById(anchorId);
+        const section = anchor ? anchor.closest("section") : null;
+        return section ? [...section.querySelectorAll(pageItemSelector)] : [];
+    };
 
     // --- Extract Experience ---
-    const experienceSection = document.querySelector("section.experience-section");
-    if (experienceSection) {
-        // You might need to click "Show all positions" or "Show all companies" if these exist.
-        await clickShowMore("button[aria-label^='Show all positions']");
-        await clickShowMore("button[aria-label^='Show all companies']");
-
-        const experienceItems = experienceSection.querySelectorAll(".pvs-list__item");
-        experienceItems.forEach(item => {
-            const title = getTextFromElement(item, "div.pvs-entity__content-wrapper div.t-bold");
-            let companyRaw = getTextFromElement(item, "div.pvs-entity__content-wrapper span.t-normal");
-            const duration = getTextFromElement(item, "div.pvs-entity__content-wrapper span.t-normal:nth-of-type(2)");
-
-            // Clean up company string (e.g., remove "Full-time", "Part-time")
-            const company = companyRaw ? companyRaw.replace(/\s*\b(Full-time|Part-time|Contract|Self-employed|Freelance|Internship)\b.*$/i, '').trim() : null;
-
-            if (title) { // Only add if a title is found
-                profile.experience.push({ title, company, duration });
-            }
-        });
-    }
+    getSectionItems(experienceDoc, "experience").forEach(item => {
+        const title = getTextFromElement(item, "div.t-bold span[aria-hidden='true']");
+        // Company and employment type share one span, e.g. "Acme · Full-time"
+        const companyRaw = getTextFromElement(item, "span.t-14.t-normal span[aria-hidden='true']");
+        const company = companyRaw ? companyRaw.split("·")[0].trim() : null;
+        const duration = getTextFromElement(item, "span.t-14.t-normal.t-black--light span[aria-hidden='true']");
+
+        if (title) { // Only add if a title is found
+            profile.experience.push({ title, company, duration });
+        }
+    });
     console.log("Experience:", profile.experience);
 
     // --- Extract Education ---
-    const educationSection = document.querySelector("section.education-section");
-    if (educationSection) {
-        await clickShowMore("button[aria-label^='Show all education']");
-        const educationItems = educationSection.querySelectorAll(".pvs-list__item");
-        educationItems.forEach(item => {
-            const school = getTextFromElement(item, "div.pvs-entity__content-wrapper div.t-bold");
-            const degree = getTextFromElement(item, "div.pvs-entity__content-wrapper span.t-normal");
-            const field = getTextFromElement(item, "div.pvs-entity__content-wrapper span.t-normal:nth-of-type(2)");
-            if (school) { // Only add if a school is found
-                profile.education.push({ school, degree, field });
-            }
-        });
-    }
+    getSectionItems(educationDoc, "education").forEach(item => {
+        const school = getTextFromElement(item, "div.t-bold span[aria-hidden='true']");
+        const degree = getTextFromElement(item, "span.t-14.t-normal span[aria-hidden='true']");
+        const duration = getTextFromElement(item, "span.t-14.t-normal.t-black--light span[aria-hidden='true']");
+        if (school) { // Only add if a school is found
+            profile.education.push({ school, degree, duration });
+        }
+    });
     console.log("Education:", profile.education);
 
     // --- Extract Skills ---
-    await clickShowMore("button[aria-label^='Show all skills']");
-    // Wait for the modal or expanded skills to appear
-    await delay(1000); // Give a moment for new content to render
     let skills = [];
-    // Try selecting skills from the main section or the modal
-    const skillElements = document.querySelectorAll(".pv-skill-category-list__item span.t-bold");
-    skillElements.forEach(el => {
-        const skillName = el.textContent.trim();
+    getSectionItems(skillsDoc, "skills").forEach(item => {
+        const skillName = getTextFromElement(item, "div.t-bold span[aria-hidden='true']");
         if (skillName && !skills.includes(skillName)) {
             skills.push(skillName);
         }
@@ -57,4 +57,12 @@ document.addEventListener('DOMContentLoaded', function () {
             window.close(); // Close the popup
         });
     }
+
+    // Switch the popup to the batch view (batch.html)
+    const batchButton = document.getElementById('batch-btn');
+    if (batchButton) {
+        batchButton.addEventListener('click', function () {
+            window.location.href = 'batch.html';
+        });
+    }
 });
\ No newline at end of file
@@ -3,6 +3,11 @@ from flask_cors import CORS
 import os
 import json
 import re # Import the regular expression module
+import base64
+import zlib
+import threading
+from concurrent.futures import ProcessPoolExecutor
+import snapshots # Raw profile snapshot storage and the parse function run in the pool
 
 app = Flask(__name__)
 CORS(app, resources={r"/*": {"origins": "*"}})
@@ -19,6 +24,13 @@ OUTPUT_DATA_DIR = os.path.join(script_dir, "..", "company_urls")
 os.makedirs(OUTPUT_DATA_DIR, exist_ok=True)
 # --- HIGHLIGHTED CHANGE END ---
 
+# Snapshot parsing is CPU-bound, so it runs in worker processes instead of the request threads.
+# Worker processes only start on the first submit.
+parse_pool = ProcessPoolExecutor()
+
+# Guards the individual profiles JSON file, which several request threads may update at once
+individual_profiles_lock = threading.Lock()
+
 def extract_name_from_linkedin_url(url):
     """
     Extracts a readable name from a LinkedIn profile URL.
@@ -101,6 +113,69 @@ def save_urls():
         return jsonify({"success": False, "message": f"Error saving file: {str(e)}"}), 500
     # --- HIGHLIGHTED CHANGE END ---
 
+def save_individual_profile(profile_url, profile_name, experiences_data, education_data=None, skills_data=None):
+    """
+    Adds or updates one profile in the individual profiles JSON file (read by sheet.py).
+    Used by both the browser-parsed and the server-parsed (snapshot) routes.
+    Raises if the file can't be written.
+    """
+    with individual_profiles_lock: # Requests are handled in threads; don't interleave read-modify-write
+        # --- HIGHLIGHTED CHANGE START ---
+        # Construct the full path using the new OUTPUT_DATA_DIR
+        # The individual profile JSON name is already dynamic via environment variable
+        individual_json_filename = os.getenv("INDIVIDUAL_PROFILE_JSON_NAME", "default_individual_profiles_data.json")
+        filepath = os.path.join(OUTPUT_DATA_DIR, individual_json_filename)
+        # --- HIGHLIGHTED CHANGE END ---
+
+        existing_profile_data = [] # This will hold the list of profile objects
+        if os.path.exists(filepath):
+            with open(filepath, 'r', encoding='utf-8') as f:
+                try:
+                    loaded_data = json.load(f)
+                    if isinstance(loaded_data, list): # Ensure the top-level is a list
+                        existing_profile_data = loaded_data
+                except json.JSONDecodeError:
+                    # If file is empty or corrupt, treat as empty list
+                    existing_profile_data = []
+
+        profile_found = False
+        for i, entry in enumerate(existing_profile_data):
+            # Check if a profile with this URL already exists
+            if entry.get('profileUrl') == profile_url:
+                # Update its experiences
+                existing_profile_data[i]['experiences'] = experiences_data
+                existing_profile_data[i]['profileName'] = profile_name # Also update name in case it changed
+                if education_data is not None:
+                    existing_profile_data[i]['education'] = education_data
+                if skills_data is not None:
+                    existing_profile_data[i]['skills'] = skills_data
+                profile_found = True
+                # --- HIGHLIGHTED CHANGE START ---
+                # Removed unicode characters
+                print(f"Updated experiences for existing profile: {profile_name} ({profile_url})")
+                # --- HIGHLIGHTED CHANGE END ---
+                break
+
+        if not profile_found:
+            # Add a new entry for this profile
+            new_entry = {
+                'profileUrl': profile_url,
+                'profileName': profile_name,
+                'experiences': experiences_data
+            }
+            if education_data is not None:
+                new_entry['education'] = education_data
+            if skills_data is not None:
+                new_entry['skills'] = skills_data
+            existing_profile_data.append(new_entry)
+            # --- HIGHLIGHTED CHANGE START ---
+            # Removed unicode characters
+            print(f"Added new profile and experiences: {profile_name} ({profile_url})")
+            # --- HIGHLIGHTED CHANGE END ---
+
+        with open(filepath, 'w', encoding='utf-8') as f:
+            json.dump(existing_profile_data, f, indent=2, ensure_ascii=False)
+
 # --- UPDATED ROUTE: Save Experience Details to include profile context ---
 @app.route('/save_experience_details', methods=['POST'])
 def save_experience_details():
@@ -110,66 +185,63 @@ def save_experience_details():
     profile_url = data.get('profileUrl')
     profile_name = data.get('profileName', 'Unknown Name') # Provide a default if name is missing
     experiences_data = data.get('experiences')
+    # Education and skills are only sent by the details-page extractor
+    education_data = data.get('education')
+    skills_data = data.get('skills')
 
-    # Basic validation
-    if not profile_url or not experiences_data:
+    # Basic validation: an empty experience list is valid (e.g. students), a missing one isn't
+    if not profile_url or experiences_data is None:
         return jsonify({'error': 'Missing profile URL or experience data'}), 400
 
-    # --- HIGHLIGHTED CHANGE START ---
-    # Construct the full path using the new OUTPUT_DATA_DIR
-    # The individual profile JSON name is already dynamic via environment variable
-    individual_json_filename = os.getenv("INDIVIDUAL_PROFILE_JSON_NAME", "default_individual_profiles_data.json")
-    filepath = os.path.join(OUTPUT_DATA_DIR, individual_json_filename)
-    # --- HIGHLIGHTED CHANGE END ---
-
-    existing_profile_data = [] # This will hold the list of profile objects
-    if os.path.exists(filepath):
-        with open(filepath, 'r', encoding='utf-8') as f:
-            try:
-                loaded_data = json.load(f)
-                if isinstance(loaded_data, list): # Ensure the top-level is a list
-                    existing_profile_data = loaded_data
-            except json.JSONDecodeError:
-                # If file is empty or corrupt, treat as empty list
-                existing_profile_data = []
-
-    profile_found = False
-    for i, entry in enumerate(existing_profile_data):
-        # Check if a profile with this URL already exists
-        if entry.get('profileUrl') == profile_url:
-            # Update its experiences
-            existing_profile_data[i]['experiences'] = experiences_data
-            existing_profile_data[i]['profileName'] = profile_name # Also update name in case it changed
-            profile_found = True
-            # --- HIGHLIGHTED CHANGE START ---
-            # Removed unicode characters
-            print(f"Updated experiences for existing profile: {profile_name} ({profile_url})")
-            # --- HIGHLIGHTED CHANGE END ---
-            break
-
-    if not profile_found:
-        # Add a new entry for this profile
-        existing_profile_data.append({
-            'profileUrl': profile_url,
-            'profileName': profile_name,
-            'experiences': experiences_data
-        })
-        # --- HIGHLIGHTED CHANGE START ---
-        # Removed unicode characters
-        print(f"Added new profile and experiences: {profile_name} ({profile_url})")
-        # --- HIGHLIGHTED CHANGE END ---
-
     try:
-        with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(existing_profile_data, f, indent=2, ensure_ascii=False)
+        save_individual_profile(profile_url, profile_name, experiences_data, education_data, skills_data)
         return jsonify({'status': 'success', 'message': f'Experiences for {profile_name} saved/updated.'})
     except Exception as e:
         # --- HIGHLIGHTED CHANGE START ---
         # Removed unicode characters
-        print(f"Error saving experience details to {filepath}: {e}")
+        print(f"Error saving experience details: {e}")
         return jsonify({"success": False, "message": f"Error saving experience details: {str(e)}"}), 500
     # --- HIGHLIGHTED CHANGE END ---
 
+# --- Save a raw profile snapshot, parse it in the process pool and save the result ---
+# This is the main path for profile details; /save_experience_details is the extension's
+# fallback when this route is unavailable.
+@app.route('/save_snapshot', methods=['POST'])
+def save_snapshot():
+    data = request.json
+
+    profile_url = data.get('profileUrl')
+    snapshot_data = data.get('snapshot') # Base64 of the gzip-compressed profile HTML
+
+    if not profile_url or not snapshot_data:
+        return jsonify({'error': 'Missing profile URL or snapshot data'}), 400
+
+    try:
+        snapshot_path = snapshots.save_snapshot(profile_url, base64.b64decode(snapshot_data))
+    except (ValueError, OSError, EOFError, zlib.error) as e:
+        # Bad URL, bad base64 or data that isn't valid gzip
+        print(f"Rejected snapshot for {profile_url}: {e}")
+        return jsonify({"success": False, "message": f"Invalid snapshot: {str(e)}"}), 400
+
+    # Wait for the worker so the extension learns whether it needs to fall back to browser parsing
+    profile = parse_pool.submit(snapshots.parse_and_store, snapshot_path).result()
+    if profile is None:
+        return jsonify({"success": False, "message": "Snapshot saved but could not be parsed."}), 500
+
+    try:
+        save_individual_profile(profile['profileUrl'], profile['profileName'],
+                                profile['experiences'], profile['education'], profile['skills'])
+    except Exception as e:
+        print(f"Error saving parsed snapshot for {profile_url}: {e}")
+        return jsonify({"success": False, "message": f"Error saving experience details: {str(e)}"}), 500
+
+    return jsonify({
+        'status': 'success',
+        'message': f"Experiences for {profile['profileName']} parsed with extractor v{profile['extractorVersion']} and saved.",
+        'profileName': profile['profileName'],
+        'experienceCount': len(profile['experiences'])
+    })
+
 if __name__ == '__main__':
     # Run the Flask app on port 5000 in debug mode (useful for development)
     app.run(port=5000, debug=True)
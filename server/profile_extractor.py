@@ -0,0 +1,200 @@
+"""
+Versioned extractor that turns a stored profile snapshot into structured data.
+
+The extension posts the raw HTML of the profile, as parts wrapped in
+<section data-snapshot-section="..."> elements:
+  name                               -> the top card name element
+  experience / education / skills    -> the fetched details page
+                                        (data-snapshot-source="details") and the
+                                        section shown on the profile page
+                                        (data-snapshot-source="page")
+The extension doesn't filter anything: choosing which source to read is done
+here. So when LinkedIn changes its markup we only need to update the rules
+here, bump EXTRACTOR_VERSION and run `python snapshots.py reparse` - no
+re-crawling needed.
+"""
+import re
+from html.parser import HTMLParser
+
+# Bump this whenever the parsing rules below change
+EXTRACTOR_VERSION = 2
+
+# Elements that never get a closing tag
+VOID_TAGS = {'area', 'base', 'br', 'col', 'embed', 'hr', 'img', 'input',
+             'link', 'meta', 'source', 'track', 'wbr'}
+
+SNAPSHOT_SECTIONS = ('experience', 'education', 'skills')
+SNAPSHOT_SOURCES = ('details', 'page')
+
+
+class _ProfileSnapshotParser(HTMLParser):
+    """
+    Collects the page title, the text of the name part and, per snapshot
+    section and source, the top-level
+    div[data-view-name='profile-component-entity'] entities.
+
+    For each entity the text of its span[aria-hidden='true'] elements is
+    recorded under the same fields content.js reads:
+      'bold'   -> inside div.t-bold (job title / school / skill)
+      'normal' -> inside span.t-14.t-normal (company / degree)
+      'light'  -> inside span.t-14.t-normal.t-black--light (duration)
+    Only the first match of each field is kept, like querySelector.
+    """
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.stack = []  # (tag, set of classes) for every open element
+        self.title_parts = None
+        self.title_done = False
+        self.name_parts = []
+        self.section = None
+        self.source = None
+        self.section_depth = None
+        self.entity = None
+        self.entity_depth = None
+        self.text_parts = None
+        self.text_depth = None
+        self.text_fields = None
+        self.entities = {(section, source): [] for section in SNAPSHOT_SECTIONS for source in SNAPSHOT_SOURCES}
+
+    def handle_starttag(self, tag, attrs):
+        if tag in VOID_TAGS:
+            return
+        attrs = dict(attrs)
+        classes = set((attrs.get('class') or '').split())
+        self.stack.append((tag, classes))
+        depth = len(self.stack)
+
+        if tag == 'title' and not self.title_done:
+            self.title_parts = []
+        elif (tag == 'section' and self.section is None
+                and attrs.get('data-snapshot-section') in SNAPSHOT_SECTIONS + ('name',)):
+            self.section = attrs['data-snapshot-section']
+            self.source = attrs.get('data-snapshot-source', 'details')
+            self.section_depth = depth
+        elif (tag == 'div' and (self.section, self.source) in self.entities and self.entity is None
+                and attrs.get('data-view-name') == 'profile-component-entity'):
+            self.entity = {}
+            self.entity_depth = depth
+        elif (tag == 'span' and self.entity is not None and self.text_parts is None
+                and attrs.get('aria-hidden') == 'true'):
+            self.text_parts = []
+            self.text_depth = depth
+            self.text_fields = self._fields_for_open_elements()
+
+    def handle_endtag(self, tag):
+        if tag in VOID_TAGS:
+            return
+        # Find the matching open element; ignore stray closing tags
+        for index in range(len(self.stack) - 1, -1, -1):
+            if self.stack[index][0] == tag:
+                break
+        else:
+            return
+        # Close everything down to (and including) the matching element
+        while len(self.stack) > index:
+            self._close_element(len(self.stack))
+            self.stack.pop()
+
+    def handle_data(self, data):
+        if self.title_parts is not None and not self.title_done:
+            self.title_parts.append(data)
+        if self.section == 'name':
+            self.name_parts.append(data)
+        if self.text_parts is not None:
+            self.text_parts.append(data)
+
+    def _fields_for_open_elements(self):
+        fields = []
+        for tag, classes in self.stack[self.entity_depth - 1:]:
+            if tag == 'div' and 't-bold' in classes:
+                fields.append('bold')
+            if tag == 'span' and {'t-14', 't-normal'} <= classes:
+                fields.append('normal')
+                if 't-black--light' in classes:
+                    fields.append('light')
+        return fields
+
+    def _close_element(self, depth):
+        tag = self.stack[depth - 1][0]
+        if tag == 'title' and self.title_parts is not None:
+            self.title_done = True
+        if depth == self.text_depth:
+            text = _clean_text(''.join(self.text_parts))
+            for field in self.text_fields:
+                self.entity.setdefault(field, text)
+            self.text_parts = self.text_depth = self.text_fields = None
+        if depth == self.entity_depth:
+            self.entities[(self.section, self.source)].append(self.entity)
+            self.entity = self.entity_depth = None
+        if depth == self.section_depth:
+            self.section = self.source = self.section_depth = None
+
+    @property
+    def title(self):
+        return _clean_text(''.join(self.title_parts or []))
+
+    @property
+    def name(self):
+        return _clean_text(''.join(self.name_parts))
+
+    def section_entities(self, section):
+        """
+        Returns the entities of a section: from the details page (the complete list)
+        if it has any, otherwise from the section shown on the profile page.
+        """
+        return self.entities[(section, 'details')] or self.entities[(section, 'page')]
+
+
+def _clean_text(text):
+    """Collapses whitespace and trims the text."""
+    return ' '.join(text.split())
+
+
+def extract_profile(html):
+    """
+    Extracts the profile name, experiences, education and skills from a snapshot.
+    Returns a dict shaped like the entries app.py saves from the extension.
+    """
+    parser = _ProfileSnapshotParser()
+    parser.feed(html)
+    parser.close()
+
+    profile_name = parser.name
+    if not profile_name:
+        # Fallback: "John Doe | LinkedIn" -> "John Doe"
+        title_match = re.match(r'^(.*?) \| LinkedIn$', parser.title)
+        profile_name = title_match.group(1).strip() if title_match else 'Unknown Profile'
+
+    experiences = []
+    for entity in parser.section_entities('experience'):
+        # Company and employment type share one span, e.g. "Acme · Full-time"
+        company = entity.get('normal', '').split('·')[0].strip()
+        experiences.append({
+            'jobTitle': entity.get('bold', ''),
+            'company': company,
+            'duration': entity.get('light', '')
+        })
+
+    education = [
+        {
+            'school': entity['bold'],
+            'degree': entity.get('normal', ''),
+            'duration': entity.get('light', '')
+        }
+        for entity in parser.section_entities('education') if entity.get('bold')
+    ]
+
+    skills = []
+    for entity in parser.section_entities('skills'):
+        skill_name = entity.get('bold')
+        if skill_name and skill_name not in skills:
+            skills.append(skill_name)
+
+    return {
+        'profileName': profile_name,
+        'experiences': experiences,
+        'education': education,
+        'skills': skills,
+        'extractorVersion': EXTRACTOR_VERSION
+    }
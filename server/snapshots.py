@@ -0,0 +1,107 @@
+"""
+Storage and parallel parsing of raw profile snapshots posted by the extension.
+
+Snapshots are kept gzip-compressed exactly as received, in company_urls/snapshots,
+with a <key>.json sidecar holding the original profile URL. On each save app.py
+runs parse_and_store in its process pool with the versioned extractor from
+profile_extractor.py and merges the result into the individual profiles JSON.
+Each parsed result is also written to company_urls/parsed/v<N>/.
+
+Usage: python snapshots.py reparse [max_workers]
+  Re-runs the current extractor version over every stored snapshot on all cores
+  and writes the combined results to company_urls/parsed_profiles_v<N>.json,
+  which has the same format as the individual profiles JSON used by sheet.py.
+"""
+import glob
+import gzip
+import json
+import os
+import re
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+from profile_extractor import EXTRACTOR_VERSION, extract_profile
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+OUTPUT_DATA_DIR = os.path.join(script_dir, "..", "company_urls")
+SNAPSHOT_DIR = os.path.join(OUTPUT_DATA_DIR, "snapshots")
+PARSED_DIR = os.path.join(OUTPUT_DATA_DIR, "parsed", f"v{EXTRACTOR_VERSION}")
+
+
+def snapshot_key(profile_url):
+    """
+    Returns a filesystem-safe key for a profile, e.g.
+    https://www.linkedin.com/in/first-last-1a2b3c/ -> first-last-1a2b3c
+    """
+    match = re.search(r'linkedin\.com/in/([^/?#]+)', profile_url)
+    if not match:
+        raise ValueError(f"Not a LinkedIn profile URL: {profile_url}")
+    return re.sub(r'[^\w.-]', '_', match.group(1))
+
+
+def save_snapshot(profile_url, compressed_html):
+    """
+    Stores a gzip-compressed snapshot for a profile, replacing any older one.
+    The original profile URL is kept in a <key>.json sidecar, since the key is lossy.
+    Raises ValueError for a bad URL and OSError/EOFError/zlib.error if the data
+    isn't valid gzip.
+    Returns the path of the stored snapshot.
+    """
+    key = snapshot_key(profile_url)
+    gzip.decompress(compressed_html)  # Validate before overwriting a good snapshot
+
+    os.makedirs(SNAPSHOT_DIR, exist_ok=True)
+    snapshot_path = os.path.join(SNAPSHOT_DIR, f"{key}.html.gz")
+    with open(snapshot_path, 'wb') as f:
+        f.write(compressed_html)
+    with open(os.path.join(SNAPSHOT_DIR, f"{key}.json"), 'w', encoding='utf-8') as f:
+        json.dump({'profileUrl': profile_url}, f, ensure_ascii=False)
+    return snapshot_path
+
+
+def parse_and_store(snapshot_path):
+    """
+    Parses one snapshot with the current extractor and writes the result to PARSED_DIR.
+    Runs inside a pool worker, so errors are printed and None is returned instead of raising.
+    """
+    key = os.path.basename(snapshot_path)[:-len(".html.gz")]
+    try:
+        with open(os.path.join(SNAPSHOT_DIR, f"{key}.json"), 'r', encoding='utf-8') as f:
+            profile_url = json.load(f)['profileUrl']
+        with gzip.open(snapshot_path, 'rt', encoding='utf-8') as f:
+            profile = extract_profile(f.read())
+        profile = {'profileUrl': profile_url, **profile}
+
+        os.makedirs(PARSED_DIR, exist_ok=True)
+        with open(os.path.join(PARSED_DIR, f"{key}.json"), 'w', encoding='utf-8') as f:
+            json.dump(profile, f, indent=2, ensure_ascii=False)
+        return profile
+    except Exception as e:
+        print(f"Error parsing snapshot {snapshot_path}: {e}")
+        return None
+
+
+def reparse(max_workers=None):
+    """
+    Re-runs the current extractor over all stored snapshots in parallel.
+    Returns the path of the combined JSON file.
+    """
+    snapshot_paths = sorted(glob.glob(os.path.join(SNAPSHOT_DIR, "*.html.gz")))
+    print(f"Reparsing {len(snapshot_paths)} snapshots with extractor v{EXTRACTOR_VERSION}...")
+
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        results = list(pool.map(parse_and_store, snapshot_paths, chunksize=8))
+    profiles = [profile for profile in results if profile is not None]
+
+    combined_path = os.path.join(OUTPUT_DATA_DIR, f"parsed_profiles_v{EXTRACTOR_VERSION}.json")
+    with open(combined_path, 'w', encoding='utf-8') as f:
+        json.dump(profiles, f, indent=2, ensure_ascii=False)
+    print(f"Saved to {combined_path} — {len(profiles)} parsed, {len(snapshot_paths) - len(profiles)} failed")
+    return combined_path
+
+
+if __name__ == '__main__':
+    if len(sys.argv) < 2 or sys.argv[1] != 'reparse':
+        print("Usage: python snapshots.py reparse [max_workers]")
+        sys.exit(1)
+    reparse(int(sys.argv[2]) if len(sys.argv) > 2 else None)